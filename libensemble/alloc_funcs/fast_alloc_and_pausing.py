@@ -1,8 +1,19 @@
 import numpy as np
+from collections import deque
+from itertools import chain
 
 from libensemble.tools.alloc_support import avail_worker_ids, sim_work, gen_work, count_gens
 
 
+def sum_of_squares(x):
+    """
+    Sum-of-squares ``combine_component_func``. When it is given in
+    ``gen_specs['user']``, the allocation function below combines the
+    components of all points at once instead of calling it once per point.
+    """
+    return np.dot(x, x)
+
+
 def give_sim_work_first(W, H, sim_specs, gen_specs, alloc_specs, persis_info):
     """
     This allocation function gives (in order) entries in ``H`` to idle workers
@@ -25,117 +36,182 @@ def give_sim_work_first(W, H, sim_specs, gen_specs, alloc_specs, persis_info):
         `test_uniform_sampling_one_residual_at_a_time.py <https://github.com/Libensemble/libensemble/blob/develop/libensemble/tests/regression_tests/test_uniform_sampling_one_residual_at_a_time.py>`_ # noqa
     """
 
-    Work = {}
-    gen_count = count_gens(W)
-
     if gen_specs['user'].get('single_component_at_a_time'):
         assert alloc_specs['user']['batch_mode'], ("Must be in batch mode when using "
                                                    "'single_component_at_a_time'")
+
+    # Nothing can be given out when every worker is busy and H is unchanged
+    if len(H) == persis_info['H_len'] and np.all(W['active']):
+        return {}, persis_info
+
+    # need_to_give used to be a set; keep accepting one
+    if not isinstance(persis_info['need_to_give'], deque):
+        persis_info['need_to_give'] = deque(sorted(persis_info['need_to_give']))
+
+    Work = {}
+    gen_count = count_gens(W)
+
+    # Look up each field of H once; 'paused' is a view, so writes through it update H
+    sim_id_col = H['sim_id']
+    pt_id_col = H['pt_id']
+    f_i_col = H['f_i']
+    returned_col = H['returned']
+    paused_col = H['paused']
+
     if len(H) != persis_info['H_len']:
         # Something new is in the history.
-        persis_info['need_to_give'].update(H['sim_id'][persis_info['H_len']:].tolist())
+        old_len = persis_info['H_len']
+        persis_info['need_to_give'].extend(sim_id_col[old_len:].tolist())
         persis_info['H_len'] = len(H)
-        persis_info['pt_ids'] = set(np.unique(H['pt_id']))
-        for pt_id in persis_info['pt_ids']:
-            persis_info['inds_of_pt_ids'][pt_id] = H['pt_id'] == pt_id
+        # Group only the new rows of H by pt_id with a single stable sort
+        order = old_len + np.argsort(pt_id_col[old_len:], kind='stable')
+        uniq, starts = np.unique(pt_id_col[order], return_index=True)
+        new_pt_ids = set(uniq.tolist())
+        # pt_ids that are neither complete nor have a NaN, kept up to date as those sets grow
+        persis_info.setdefault('active_pt_ids', set()).update(
+            new_pt_ids - persis_info['has_nan'] - persis_info['complete'])
+        inds_of_pt_ids = persis_info['inds_of_pt_ids']
+        for pt_id, inds in zip(uniq.tolist(), np.split(order, starts[1:])):
+            if pt_id in inds_of_pt_ids:
+                inds_of_pt_ids[pt_id] = np.concatenate((inds_of_pt_ids[pt_id], inds))
+            else:
+                inds_of_pt_ids[pt_id] = inds
 
     idle_workers = avail_worker_ids(W)
 
-    while len(idle_workers):
-
+    # H only changes below through the rows paused here, so the pt_ids to pause
+    # are found once per call rather than once per idle worker
+    if len(idle_workers) and len(persis_info['need_to_give']):
         pt_ids_to_pause = set()
-
-        # Find indices of H that are not yet given out to be evaluated
-        if len(persis_info['need_to_give']):
-            # If 'stop_on_NaN' is true and any f_i is a NaN, then pause
-            # evaluations of other f_i, corresponding to the same pt_id
-            if alloc_specs['user'].get('stop_on_NaNs'):
-                pt_ids_to_pause.update(H['pt_id'][np.isnan(H['f_i'])])
-
-            # If 'stop_partial_fvec_eval' is true, pause entries in H if a
-            # partial combine_component_func evaluation is # worse than the
-            # best, known, complete evaluation (and the point is not a
-            # local_pt).
-            if alloc_specs['user'].get('stop_partial_fvec_eval'):
-                pt_ids = set(persis_info['pt_ids']) - persis_info['has_nan'] - persis_info['complete']
-                pt_ids = np.array(list(pt_ids))
-                partial_fvals = np.zeros(len(pt_ids))
-
-                # Mark 'complete' and 'has_nan' pt_ids, compute complete and partial fvals
-                for j, pt_id in enumerate(pt_ids):
-
-                    a1 = persis_info['inds_of_pt_ids'][pt_id]
-                    if np.any(np.isnan(H['f_i'][a1])):
-                        persis_info['has_nan'].add(pt_id)
-                        continue
-
-                    if 'local_pt' in H.dtype.names and H['local_pt'][a1][0]:
-                        persis_info['local_pt_ids'].add(pt_id)
-
-                    if np.all(H['returned'][a1]):
-                        persis_info['complete'].add(pt_id)
-                        values = gen_specs['user']['combine_component_func'](H['f_i'][a1])
+        nan_mask = np.isnan(f_i_col)
+
+        # If 'stop_on_NaN' is true and any f_i is a NaN, then pause
+        # evaluations of other f_i, corresponding to the same pt_id
+        if alloc_specs['user'].get('stop_on_NaNs'):
+            pt_ids_to_pause.update(pt_id_col[nan_mask])
+
+        # If 'stop_partial_fvec_eval' is true, pause entries in H if a
+        # partial combine_component_func evaluation is # worse than the
+        # best, known, complete evaluation (and the point is not a
+        # local_pt).
+        if alloc_specs['user'].get('stop_partial_fvec_eval'):
+            active_pt_ids = persis_info['active_pt_ids']
+            pt_ids = np.fromiter(active_pt_ids, dtype=int, count=len(active_pt_ids))
+
+            if len(pt_ids):
+                # Flatten the rows of all pt_ids so each group is reduced in one pass
+                group_inds = [persis_info['inds_of_pt_ids'][pt_id] for pt_id in pt_ids.tolist()]
+                group_lens = np.fromiter(map(len, group_inds), dtype=int, count=len(group_inds))
+                group_starts = np.concatenate(([0], np.cumsum(group_lens)[:-1]))
+                flat_inds = np.concatenate(group_inds)
+
+                # Mark 'has_nan', 'local_pt' and 'complete' pt_ids
+                has_nan = np.logical_or.reduceat(nan_mask[flat_inds], group_starts)
+                all_returned = np.logical_and.reduceat(returned_col[flat_inds], group_starts)
+                persis_info['has_nan'].update(pt_ids[has_nan].tolist())
+                active_pt_ids.difference_update(pt_ids[has_nan].tolist())
+
+                is_local = np.zeros(len(pt_ids), dtype=bool)
+                if 'local_pt' in H.dtype.names:
+                    is_local = H['local_pt'][flat_inds[group_starts]] & ~has_nan
+                    persis_info['local_pt_ids'].update(pt_ids[is_local].tolist())
+
+                combine_component_func = gen_specs['user']['combine_component_func']
+                if combine_component_func is sum_of_squares:
+                    f_i_flat = f_i_col[flat_inds]
+                    group_fvals = np.add.reduceat(f_i_flat*f_i_flat, group_starts)
+
+                # combine_component_func is only called for newly complete pt_ids ...
+                newly_complete = np.flatnonzero(all_returned & ~has_nan)
+                persis_info['complete'].update(pt_ids[newly_complete].tolist())
+                active_pt_ids.difference_update(pt_ids[newly_complete].tolist())
+                if combine_component_func is sum_of_squares:
+                    if len(newly_complete):
+                        persis_info['best_complete_val'] = min(persis_info['best_complete_val'],
+                                                               group_fvals[newly_complete].min())
+                else:
+                    for j in newly_complete:
+                        values = combine_component_func(f_i_col[group_inds[j]])
                         persis_info['best_complete_val'] = min(persis_info['best_complete_val'], values)
-                    else:
-                        # Ensure combine_component_func calculates partial fevals correctly
-                        # with H['f_i'] = 0 for non-returned point
-                        partial_fvals[j] = gen_specs['user']['combine_component_func'](H['f_i'][a1])
 
+                # ... and for incomplete ones when there is a best value to compare against
                 if len(persis_info['complete']) and len(pt_ids) > 1:
+                    incomplete = np.flatnonzero(~all_returned & ~has_nan & ~is_local)
 
-                    worse_flag = np.zeros(len(pt_ids), dtype=bool)
-                    for j, pt_id in enumerate((pt_ids)):
-                        if (not np.isnan(partial_fvals[j])) and \
-                           (pt_id not in persis_info['local_pt_ids']) and \
-                           (pt_id not in persis_info['complete']) and \
-                           (partial_fvals[j] > persis_info['best_complete_val']):
-                            worse_flag[j] = True
-
-                    # Pause incompete evaluations with worse_flag==True
-                    pt_ids_to_pause.update(pt_ids[worse_flag])
-
-            if not pt_ids_to_pause.issubset(persis_info['already_paused']):
-                persis_info['already_paused'].update(pt_ids_to_pause)
-                sim_ids_to_remove = np.in1d(H['pt_id'], list(pt_ids_to_pause))
-                H['paused'][sim_ids_to_remove] = True
-
-                persis_info['need_to_give'] = persis_info['need_to_give'].difference(np.where(sim_ids_to_remove)[0])
-
-            if len(persis_info['need_to_give']) != 0:
-                next_row = persis_info['need_to_give'].pop()
-                i, idle_workers = idle_workers[0], idle_workers[1:]
-                sim_work(Work, i, sim_specs['in'], [next_row], [])
-
-        elif gen_count < alloc_specs['user'].get('num_active_gens', gen_count+1):
-            lw = persis_info['last_worker']
-
-            last_size = persis_info.get('last_size')
-            if len(H):
-                # Don't give gen instances in batch mode if points are unfinished
-                if (alloc_specs['user'].get('batch_mode')
-                    and not all(np.logical_or(H['returned'][last_size:],
-                                              H['paused'][last_size:]))):
+                    # Ensure combine_component_func calculates partial fevals correctly
+                    # with H['f_i'] = 0 for non-returned point
+                    if combine_component_func is sum_of_squares:
+                        partial_fvals = group_fvals[incomplete]
+                    else:
+                        partial_fvals = np.array([combine_component_func(f_i_col[group_inds[j]])
+                                                  for j in incomplete], dtype=float)
+
+                    # Pause incomplete evaluations that are worse (NaN comparisons are False)
+                    worse_flag = partial_fvals > persis_info['best_complete_val']
+                    pt_ids_to_pause.update(pt_ids[incomplete[worse_flag]].tolist())
+
+        # Rows of previously paused pt_ids are already marked, so only pause new ones
+        new_pauses = pt_ids_to_pause - persis_info['already_paused']
+        if new_pauses:
+            persis_info['already_paused'].update(new_pauses)
+            inds_of_pt_ids = persis_info['inds_of_pt_ids']
+            paused_col[np.concatenate([inds_of_pt_ids[pt_id] for pt_id in new_pauses])] = True
+
+    # Give sim work for unpaused rows of H not yet given out, one per idle worker.
+    # Paused rows stay in the queue and are dropped when they reach the front.
+    need_to_give = persis_info['need_to_give']
+    rows_to_give = []
+    while len(need_to_give) and len(rows_to_give) < len(idle_workers):
+        next_row = need_to_give.popleft()
+        if not paused_col[next_row]:
+            rows_to_give.append(next_row)
+
+    for i, next_row in zip(idle_workers, rows_to_give):
+        sim_work(Work, i, sim_specs['in'], [next_row], [])
+
+    # Any workers still idle may be given gen work
+    for i in idle_workers[len(rows_to_give):]:
+        if gen_count >= alloc_specs['user'].get('num_active_gens', gen_count+1):
+            break
+
+        lw = persis_info['last_worker']
+
+        last_size = persis_info.get('last_size')
+        if len(H):
+            # Don't give gen instances in batch mode if points are unfinished.
+            # Rows are never un-returned or un-paused, so only rows that were
+            # unfinished at the last check (and any new rows) are checked.
+            if alloc_specs['user'].get('batch_mode'):
+                unfinished = np.concatenate((persis_info.get('batch_unfinished', np.zeros(0, dtype=int)),
+                                             np.arange(persis_info.get('batch_checked', last_size or 0), len(H))))
+                unfinished = unfinished[~np.logical_or(returned_col[unfinished], paused_col[unfinished])]
+                persis_info['batch_unfinished'] = unfinished
+                persis_info['batch_checked'] = len(H)
+                if len(unfinished):
+                    break
+            # Don't call APOSMM if there are runs going but none need advancing
+            if len(persis_info[lw]['run_order']):
+                # A run needs advancing if all of its points have returned. The runs are
+                # laid out in one contiguous index array with an offset for each run.
+                run_inds = persis_info[lw]['run_order'].values()
+                run_lens = np.fromiter(map(len, run_inds), dtype=np.int32, count=len(run_inds))
+                run_offsets = np.zeros(len(run_lens), dtype=np.int32)
+                np.cumsum(run_lens[:-1], out=run_offsets[1:])
+                run_order_flat = np.fromiter(chain.from_iterable(run_inds), dtype=np.int32, count=run_lens.sum())
+                runs_needing_to_advance = np.logical_and.reduceat(returned_col[run_order_flat], run_offsets)
+
+                if not np.any(runs_needing_to_advance):
                     break
-                # Don't call APOSMM if there are runs going but none need advancing
-                if len(persis_info[lw]['run_order']):
-                    runs_needing_to_advance = np.zeros(len(persis_info[lw]['run_order']), dtype=bool)
-                    for run, inds in enumerate(persis_info[lw]['run_order'].values()):
-                        runs_needing_to_advance[run] = np.all(H['returned'][inds])
-
-                    if not np.any(runs_needing_to_advance):
-                        break
-
-            persis_info['last_size'] = len(H)
 
-            # Give gen work
-            persis_info['total_gen_calls'] += 1
-            gen_count += 1
-            i, idle_workers = idle_workers[0], idle_workers[1:]
-            gen_work(Work, i, gen_specs['in'], range(len(H)), persis_info[lw])
+        persis_info['last_size'] = len(H)
+        persis_info.pop('batch_unfinished', None)
+        persis_info.pop('batch_checked', None)
 
-            persis_info['last_worker'] = i
+        # Give gen work
+        persis_info['total_gen_calls'] += 1
+        gen_count += 1
+        gen_work(Work, i, gen_specs['in'], range(len(H)), persis_info[lw])
 
-        elif gen_count >= alloc_specs['user'].get('num_active_gens', gen_count+1):
-            idle_workers = []
+        persis_info['last_worker'] = i
 
     return Work, persis_info
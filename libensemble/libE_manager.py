@@ -217,10 +217,30 @@ class Manager:
         count = k*(count//k)
         filename = fname.format(self.date_start, count)
         if not os.path.isfile(filename) and count > 0:
-            for old_file in glob.glob(fname.format(self.date_start, '*')):
+            old_files = glob.glob(fname.format(self.date_start, '*'))
+            if len(old_files) == 1 and self._update_saved_H(old_files[0], filename):
+                return
+            for old_file in old_files:
                 os.remove(old_file)
             np.save(filename, self.hist.H)
 
+    def _update_saved_H(self, old_filename, filename):
+        """Writes the filled rows of H into the last checkpoint in place and moves
+        it to filename. Returns False if it cannot be read or H has changed shape."""
+        try:
+            saved_H = np.load(old_filename, mmap_mode='r+')
+        except (OSError, ValueError):
+            return False
+        if saved_H.shape != self.hist.H.shape or saved_H.dtype != self.hist.H.dtype:
+            del saved_H
+            return False
+        # Rows past hist.index are still unfilled, as they were when last saved
+        saved_H[:self.hist.index] = self.hist.H[:self.hist.index]
+        saved_H.flush()
+        del saved_H
+        os.rename(old_filename, filename)
+        return True
+
     def _save_every_k_sims(self):
         "Saves history every kth sim step"
         self._save_every_k('libE_history_for_run_starting_{}_after_sim_{}.npy',
@@ -20,10 +20,16 @@ def branin(x1, x2):
     return f
 
 
+def branin_func(x):
+    """ Evaluates the Branin function at each row of an (N, 2) array of points """
+    x = np.atleast_2d(x)
+    return branin(x[:, 0], x[:, 1])
+
+
 if __name__ == "__main__":
 
-    x = np.loadtxt('./x.in')
-    assert len(x) == 2, "branin.py is two dimensional"
+    x = np.load('./x.in.npy')
+    assert x.shape[1] == 2, "branin.py is two dimensional"
 
-    f = branin(x[0], x[1])
-    np.savetxt('f.out', [f])
+    f = branin_func(x)
+    np.save('f.out.npy', f)
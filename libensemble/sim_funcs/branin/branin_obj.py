@@ -1,10 +1,11 @@
 """
 Calls the branin function. Default behavior uses the python function, but
-uncommenting lines will write x.in to file, call branin.py, and then read f.out.
+uncommenting lines will write x.in.npy to file, call branin.py, and then read
+f.out.npy.
 """
 import numpy as np
 import time
-from libensemble.sim_funcs.branin.branin import branin
+from libensemble.sim_funcs.branin.branin import branin_func
 
 
 def call_branin(H, persis_info, sim_specs, _):
@@ -14,16 +15,15 @@ def call_branin(H, persis_info, sim_specs, _):
 
     H_o = np.zeros(batch, dtype=sim_specs['out'])
 
-    for i, x in enumerate(H['x']):
-        # Uncomment the following if you want to use the file system to do evaluations
-        # devnull = open(os.devnull, 'w')
-        # np.savetxt('./x.in', x, fmt='%16.16f', delimiter=' ', newline=" ")
-        # p = subprocess.call(['python', 'branin.py'], cwd='./', stdout=devnull)
-        # H_o['f'][i] = np.loadtxt('./f.out', dtype=float)
+    # Uncomment the following if you want to use the file system to do evaluations
+    # np.save('./x.in.npy', H['x'])
+    # p = subprocess.call(['python', 'branin.py'], cwd='./', stdout=subprocess.DEVNULL)
+    # H_o['f'] = np.load('./f.out.npy')
 
-        H_o['f'][i] = branin(x[0], x[1])
+    H_o['f'] = branin_func(H['x'])
 
-        if 'user' in sim_specs and 'uniform_random_pause_ub' in sim_specs['user']:
+    if 'user' in sim_specs and 'uniform_random_pause_ub' in sim_specs['user']:
+        for i in range(batch):
             time.sleep(sim_specs['user']['uniform_random_pause_ub']*np.random.uniform())
 
     return H_o, persis_info
@@ -1,5 +1,6 @@
 import numpy as np
 import copy
+from collections import deque
 
 branin_vals_and_minima = np.array([[-3.14159, 12.275, 0.397887],
                                    [3.14159, 2.275, 0.397887],
@@ -72,7 +73,7 @@ persis_info_2.pop(0)
 # give_sim_work_first_pausing persis_info
 persis_info_3 = copy.deepcopy(persis_info_1)
 persis_info_3.pop('next_to_give')
-persis_info_3['need_to_give'] = set()
+persis_info_3['need_to_give'] = deque()
 persis_info_3['complete'] = set()
 persis_info_3['has_nan'] = set()
 persis_info_3['already_paused'] = set()
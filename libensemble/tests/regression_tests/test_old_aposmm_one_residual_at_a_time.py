@@ -23,7 +23,7 @@ import libensemble.gen_funcs
 libensemble.gen_funcs.rc.aposmm_optimizers = 'petsc'
 from libensemble.gen_funcs.old_aposmm import aposmm_logic as gen_f
 
-from libensemble.alloc_funcs.fast_alloc_and_pausing import give_sim_work_first as alloc_f
+from libensemble.alloc_funcs.fast_alloc_and_pausing import give_sim_work_first as alloc_f, sum_of_squares
 from libensemble.tools import parse_args, save_libE_output, add_unique_random_streams
 from libensemble.tests.regression_tests.support import persis_info_3 as persis_info, aposmm_gen_out as gen_out
 
@@ -53,7 +53,7 @@ gen_specs = {'gen_f': gen_f,
                       'dist_to_bound_multiple': 0.5,
                       'single_component_at_a_time': True,
                       'components': m,
-                      'combine_component_func': lambda x: np.sum(np.power(x, 2))}
+                      'combine_component_func': sum_of_squares}
              }
 
 gen_specs['user'].update({'grtol': 1e-4, 'gatol': 1e-4, 'frtol': 1e-15, 'fatol': 1e-15})
@@ -25,7 +25,7 @@ from copy import deepcopy
 from libensemble.libE import libE
 from libensemble.sim_funcs.chwirut1 import chwirut_eval as sim_f
 from libensemble.gen_funcs.sampling import uniform_random_sample_obj_components as gen_f
-from libensemble.alloc_funcs.fast_alloc_and_pausing import give_sim_work_first
+from libensemble.alloc_funcs.fast_alloc_and_pausing import give_sim_work_first, sum_of_squares
 from libensemble.tests.regression_tests.support import persis_info_3 as persis_info
 from libensemble.tools import parse_args, save_libE_output, add_unique_random_streams
 
@@ -57,7 +57,7 @@ gen_specs = {'gen_f': gen_f,
                      ('pt_id', int)],
              'user': {'gen_batch_size': 2,
                       'single_component_at_a_time': True,
-                      'combine_component_func': lambda x: np.sum(np.power(x, 2)),
+                      'combine_component_func': sum_of_squares,
                       'lb': (-2-np.pi/10)*np.ones(n),
                       'ub': 2*np.ones(n),
                       'components': m}
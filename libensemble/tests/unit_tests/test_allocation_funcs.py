@@ -1,9 +1,13 @@
+import numpy as np
 from mpi4py import MPI
 
 import libensemble.libE_manager as man
 import libensemble.tests.unit_tests.setup as setup
 from libensemble.alloc_funcs.give_sim_work_first import give_sim_work_first
+from libensemble.alloc_funcs.fast_alloc_and_pausing import give_sim_work_first as give_sim_work_first_pausing
 from libensemble.history import History
+from libensemble.message_numbers import EVAL_SIM_TAG, EVAL_GEN_TAG
+import libensemble.tools.alloc_support as als
 
 al = {'alloc_f': give_sim_work_first, 'out': []}
 libE_specs = {'comm': MPI.COMM_WORLD}
@@ -24,5 +28,58 @@ def test_decide_work_and_resources():
     assert len(Work) == 0
 
 
+def test_pausing_alloc_all_workers_active():
+
+    sim_specs, gen_specs, exit_criteria = setup.make_criteria_and_specs_1()
+    hist = History(al, sim_specs, gen_specs, exit_criteria, H0)
+
+    W = np.zeros(4, dtype=man.Manager.worker_dtype)
+    W['worker_id'] = np.arange(len(W)) + 1
+
+    # Don't give out work when all workers are active and nothing is new in H
+    W['active'] = 1
+    persis_info = {'H_len': 0}
+    Work, persis_info = give_sim_work_first_pausing(W, hist.H[:0], sim_specs, gen_specs, {'user': {}}, persis_info)
+    assert len(Work) == 0
+    assert persis_info == {'H_len': 0}
+
+
+def test_pausing_alloc_need_to_give_set():
+
+    H = np.zeros(4, dtype=[('sim_id', int), ('pt_id', int), ('f_i', float), ('returned', bool), ('paused', bool)])
+    H['sim_id'] = np.arange(len(H))
+    H['pt_id'] = [0, 0, 1, 1]
+
+    W = np.zeros(2, dtype=man.Manager.worker_dtype)
+    W['worker_id'] = np.arange(len(W)) + 1
+
+    # A need_to_give seeded as a set (the old persis_info format) still works
+    persis_info = {'need_to_give': set(), 'H_len': 0, 'has_nan': set(), 'complete': set(),
+                   'inds_of_pt_ids': {}, 'already_paused': set()}
+    Work, persis_info = give_sim_work_first_pausing(W, H, {'in': ['x']}, {'in': [], 'user': {}},
+                                                    {'user': {}}, persis_info)
+    assert [Work[i]['libE_info']['H_rows'] for i in sorted(Work)] == [[0], [1]]
+    assert list(persis_info['need_to_give']) == [2, 3]
+
+
+def test_gen_counts():
+
+    W = np.zeros(4, dtype=man.Manager.worker_dtype)
+    W['worker_id'] = np.arange(len(W)) + 1
+    assert als.count_gens(W) == 0
+    assert not als.test_any_gen(W)
+    assert als.count_persis_gens(W) == 0
+
+    W['active'][0] = EVAL_GEN_TAG
+    W['persis_state'][0] = EVAL_GEN_TAG
+    W['active'][1] = EVAL_SIM_TAG
+    assert als.count_gens(W) == 1
+    assert als.test_any_gen(W)
+    assert als.count_persis_gens(W) == 1
+
+
 if __name__ == "__main__":
     test_decide_work_and_resources()
+    test_pausing_alloc_all_workers_active()
+    test_pausing_alloc_need_to_give_set()
+    test_gen_counts()
@@ -1,3 +1,4 @@
+import os
 import time
 import numpy as np
 import numpy.lib.recfunctions
@@ -53,7 +54,41 @@ def test_term_test_3():
     #
 
 
+def test_save_every_k():
+    hist, sim_specs, gen_specs, exit_criteria, al = setup.hist_setup2()
+    mgr = man.Manager(hist, libE_specs, al, sim_specs, gen_specs, exit_criteria)
+    fname = 'test_save_every_k_{}_{}.npy'
+
+    hist.H['x'][:2] = [1, 2]
+    hist.index = 2
+    mgr._save_every_k(fname, 2, 2)
+    assert os.path.isfile(fname.format(mgr.date_start, 2))
+
+    # The checkpoint is moved and updated in place
+    hist.H['x'][:4] = [3, 4, 5, 6]
+    hist.index = 4
+    mgr._save_every_k(fname, 4, 2)
+    assert not os.path.isfile(fname.format(mgr.date_start, 2))
+    assert np.array_equal(np.load(fname.format(mgr.date_start, 4)), hist.H)
+
+    # After H grows, the checkpoint is written again
+    hist.grow_H(3)
+    mgr._save_every_k(fname, 6, 2)
+    assert not os.path.isfile(fname.format(mgr.date_start, 4))
+    assert np.array_equal(np.load(fname.format(mgr.date_start, 6)), hist.H)
+    os.remove(fname.format(mgr.date_start, 6))
+
+    # An unreadable checkpoint is replaced rather than reused
+    with open(fname.format(mgr.date_start, 2), 'w') as f:
+        f.write('not a numpy file')
+    mgr._save_every_k(fname, 4, 2)
+    assert not os.path.isfile(fname.format(mgr.date_start, 2))
+    assert np.array_equal(np.load(fname.format(mgr.date_start, 4)), hist.H)
+    os.remove(fname.format(mgr.date_start, 4))
+
+
 if __name__ == "__main__":
     test_term_test_1()
     test_term_test_2()
     test_term_test_3()
+    test_save_every_k()
@@ -22,7 +22,7 @@ def count_gens(W):
 
     :param W: :doc:`Worker array<../data_structures/worker_array>`
     """
-    return sum(W['active'] == EVAL_GEN_TAG)
+    return np.count_nonzero(W['active'] == EVAL_GEN_TAG)
 
 
 def test_any_gen(W):
@@ -30,7 +30,7 @@ def test_any_gen(W):
 
     :param W: :doc:`Worker array<../data_structures/worker_array>`
     """
-    return any(W['active'] == EVAL_GEN_TAG)
+    return bool(np.any(W['active'] == EVAL_GEN_TAG))
 
 
 def count_persis_gens(W):
@@ -38,7 +38,7 @@ def count_persis_gens(W):
 
     :param W: :doc:`Worker array<../data_structures/worker_array>`
     """
-    return sum(W['persis_state'] == EVAL_GEN_TAG)
+    return np.count_nonzero(W['persis_state'] == EVAL_GEN_TAG)
 
 
 def sim_work(Work, i, H_fields, H_rows, persis_info, **libE_info):
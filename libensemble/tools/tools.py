@@ -91,7 +91,7 @@ def save_libE_output(H, persis_info, calling_file, nworkers, mess='Run completed
     script_name = os.path.splitext(os.path.basename(calling_file))[0]
     short_name = script_name.split("test_", 1).pop()
     prob_str = 'length=' + str(len(H)) \
-                         + '_evals=' + str(sum(H['returned'])) \
+                         + '_evals=' + str(np.count_nonzero(H['returned'])) \
                          + '_workers=' + str(nworkers)
 
     h_filename = short_name + '_history_' + prob_str